@@ -0,0 +1,136 @@
+import threading
+from functools import wraps
+from flask import request
+
+
+class RouteLimit:
+    """Concurrency slots, a bounded wait queue and a cap on coalesced followers"""
+
+    def __init__(self, concurrency, queue, followers=0):
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.max_queue = queue
+        self.waiting = 0
+        self.max_followers = followers
+        self.following = 0
+        self.lock = threading.Lock()
+
+
+class Flight:
+    """A request already being computed that identical requests can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class AdmissionController:
+    """Per-route concurrency limits for heavy endpoints.
+
+    Requests over the limit wait in a bounded queue; when the queue is full
+    they get a 429, and if they wait longer than ADMISSION_QUEUE_TIMEOUT
+    they get a 503. Both carry a Retry-After header. Limits are per worker
+    process and rely on threaded workers (see gunicorn.conf.py), so the real
+    ceiling is limit x gunicorn workers.
+    """
+
+    def __init__(self, app=None):
+        self.limits = {}
+        self.flights = {}
+        self.flights_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("ADMISSION_LIMITS", {})
+        app.config.setdefault("ADMISSION_QUEUE_TIMEOUT", 10)
+        app.config.setdefault("ADMISSION_RETRY_AFTER", 5)
+        app.config.setdefault("ADMISSION_RUN_BUDGET", 30)
+        self.app = app
+        for name, settings in app.config["ADMISSION_LIMITS"].items():
+            self.limits[name] = RouteLimit(settings['concurrency'], settings['queue'], settings.get('followers', 0))
+
+    def reject(self, status, message):
+        retry_after = str(self.app.config["ADMISSION_RETRY_AFTER"])
+        return message, status, {'Retry-After': retry_after}
+
+    def run_admitted(self, name, view, args, kwargs):
+        limit = self.limits.get(name)
+        if limit is None:
+            return view(*args, **kwargs)
+
+        if not limit.slots.acquire(blocking=False):
+            with limit.lock:
+                if limit.waiting >= limit.max_queue:
+                    return self.reject(429, "Too many requests for this page, please retry shortly")
+                limit.waiting += 1
+            try:
+                admitted = limit.slots.acquire(timeout=self.app.config["ADMISSION_QUEUE_TIMEOUT"])
+            finally:
+                with limit.lock:
+                    limit.waiting -= 1
+            if not admitted:
+                return self.reject(503, "Server busy, please retry shortly")
+
+        try:
+            return view(*args, **kwargs)
+        finally:
+            limit.slots.release()
+
+    def follow(self, name, flight):
+        """Wait for the leader's result instead of computing it again.
+
+        Followers have their own cap so they never take queue places from
+        distinct requests. They wait as long as the leader may: its queue
+        time plus ADMISSION_RUN_BUDGET for the view itself. gthread workers
+        keep heartbeating while a request thread hangs, so nothing else
+        would release a follower stuck behind a hung leader.
+        """
+        limit = self.limits.get(name)
+        if limit is not None:
+            with limit.lock:
+                if limit.following >= limit.max_followers:
+                    return self.reject(429, "Too many requests for this page, please retry shortly")
+                limit.following += 1
+        try:
+            timeout = self.app.config["ADMISSION_QUEUE_TIMEOUT"] + self.app.config["ADMISSION_RUN_BUDGET"]
+            finished = flight.done.wait(timeout)
+        finally:
+            if limit is not None:
+                with limit.lock:
+                    limit.following -= 1
+        if not finished or flight.result is None:
+            return self.reject(503, "Server busy, please retry shortly")
+        return flight.result
+
+    def limit(self, name, coalesce=False):
+        """Decorate a view to run under the named limit.
+
+        With coalesce=True, a request identical to one already in progress
+        (same path and query string) waits for that result instead of
+        computing its own. Only use it on views whose result is read-only.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not coalesce:
+                    return self.run_admitted(name, view, args, kwargs)
+
+                key = (name, request.full_path)
+                with self.flights_lock:
+                    flight = self.flights.get(key)
+                    leader = flight is None
+                    if leader:
+                        flight = self.flights[key] = Flight()
+
+                if not leader:
+                    return self.follow(name, flight)
+
+                try:
+                    flight.result = self.run_admitted(name, view, args, kwargs)
+                    return flight.result
+                finally:
+                    with self.flights_lock:
+                        self.flights.pop(key, None)
+                    flight.done.set()
+            return wrapper
+        return decorator
@@ -3,6 +3,9 @@ import os
 import csv
 from flask import Flask, render_template, request, redirect, url_for, Response, flash
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sketches import KLLSketch
+from admission import AdmissionController
 
 app = Flask(__name__)
 
@@ -20,11 +23,28 @@ app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
 app.config["SECRET_KEY"] = "demo-secret-key-12345"
 
+# Admission control for heavy endpoints (limits are per gunicorn worker)
+app.config["ADMISSION_LIMITS"] = {
+	'import': {'concurrency': int(os.environ.get('ADMISSION_IMPORT_CONCURRENCY', 1)), 'queue': 0},
+	'export': {'concurrency': int(os.environ.get('ADMISSION_EXPORT_CONCURRENCY', 2)), 'queue': 2},
+	'dashboard': {'concurrency': int(os.environ.get('ADMISSION_DASHBOARD_CONCURRENCY', 2)), 'queue': 4, 'followers': 6}
+}
+app.config["ADMISSION_QUEUE_TIMEOUT"] = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT', 10))
+app.config["ADMISSION_RETRY_AFTER"] = int(os.environ.get('ADMISSION_RETRY_AFTER', 5))
+# How long a duplicate dashboard request waits on the one already computing, on top of the queue timeout
+app.config["ADMISSION_RUN_BUDGET"] = float(os.environ.get('ADMISSION_RUN_BUDGET', 30))
+
+# Archiving: finished applications move to applications_archive after ARCHIVE_AFTER_DAYS,
+# anything else after ARCHIVE_STALE_AFTER_DAYS
+app.config["ARCHIVE_STAGES"] = ['Rejected', 'No Response']
+app.config["ARCHIVE_AFTER_DAYS"] = int(os.environ.get('ARCHIVE_AFTER_DAYS', 60))
+app.config["ARCHIVE_STALE_AFTER_DAYS"] = int(os.environ.get('ARCHIVE_STALE_AFTER_DAYS', 365))
+
 db = SQLAlchemy(app)
+admission = AdmissionController(app)
 
-class Job(db.Model):
-    __tablename__ = "applications"
-    
+class JobFields:
+    """Columns shared by active and archived applications"""
     id = db.Column(db.Integer, primary_key=True)
     company_name = db.Column(db.String)
     job_title = db.Column(db.String)
@@ -40,10 +60,116 @@ class Job(db.Model):
     total_score = db.Column(db.Float)
     notes = db.Column(db.String)
 
+class Job(JobFields, db.Model):
+    __tablename__ = "applications"
+    is_archived = False
+
+class ArchivedJob(JobFields, db.Model):
+    """Cold storage for old, finished applications"""
+    __tablename__ = "applications_archive"
+    is_archived = True
+    
+    # Own id: applications ids get reused once the table is emptied (import, reseed)
+    original_id = db.Column(db.Integer)
+    archived_at = db.Column(db.String)
+
+class ScoreSketch(db.Model):
+    """Persisted quantile sketch for one score metric within one group"""
+    __tablename__ = "score_sketches"
+    __table_args__ = (db.UniqueConstraint('dimension', 'group_key', 'metric'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    dimension = db.Column(db.String)  # 'all', 'status' or 'industry'
+    group_key = db.Column(db.String)
+    metric = db.Column(db.String)
+    count = db.Column(db.Integer, default=0)
+    sketch = db.Column(db.Text)
+
+@event.listens_for(db.session, "before_flush")
+def update_score_sketches(session, flush_context, instances):
+    """Fold newly inserted applications into the percentile sketches on every write"""
+    new_jobs = [obj for obj in session.new if isinstance(obj, Job)]
+    if new_jobs:
+        record_score_sketches(new_jobs)
+
+class JobRollup(db.Model):
+    """Counts and score sums of archived applications, per chart group and application date"""
+    __tablename__ = "archive_rollups"
+    __table_args__ = (db.UniqueConstraint('dimension', 'group_key', 'application_date'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    dimension = db.Column(db.String)  # 'all', 'status', 'industry', 'location', 'score_bucket', ...
+    group_key = db.Column(db.String)
+    application_date = db.Column(db.String)
+    count = db.Column(db.Integer, default=0)
+    total_interest = db.Column(db.Float, default=0)
+    total_career_fit = db.Column(db.Float, default=0)
+    total_growth = db.Column(db.Float, default=0)
+    total_salary = db.Column(db.Float, default=0)
+    total_overall = db.Column(db.Float, default=0)
+
+# Create any tables added since the database was first set up (existing tables are left alone).
+# gunicorn.conf.py preloads the app, so this runs once in the master rather than racing in each
+# worker; the pooled connections are dropped afterwards so forked workers don't share them.
+with app.app_context():
+    db.create_all()
+    db.engine.dispose()
+
 # Predefined options for dropdowns
 STAGE_OPTIONS = ['Applied', 'Phone Screen', 'Technical Interview', 'Final Interview', 'Offer', 'Rejected', 'No Response']
 SCORE_OPTIONS = [1, 2, 3, 4, 5]
 
+# Column, descending, fallback for missing values - used for SQL and in-memory sorting
+JOB_SORTS = {
+    'newest': ('application_date', True, ''),
+    'oldest': ('application_date', False, ''),
+    'highest_score': ('total_score', True, 0),
+    'lowest_score': ('total_score', False, 0),
+    'company': ('company_name', False, '')
+}
+
+# Rollup sum column -> Job score column
+ROLLUP_SCORE_COLUMNS = {
+    'total_interest': 'interest_level',
+    'total_career_fit': 'career_fit_now',
+    'total_growth': 'growth_potential',
+    'total_salary': 'salary_fit',
+    'total_overall': 'total_score'
+}
+
+# Score columns tracked by the percentile sketches
+SKETCH_METRICS = ['total_score', 'interest_level', 'career_fit_now', 'growth_potential', 'salary_fit']
+
+def filter_jobs(model, search_query, status_filter, score_filter, sort_by):
+    """Build the listing query for Job or ArchivedJob"""
+    jobs_query = model.query
+    
+    # Apply search filter
+    if search_query:
+        jobs_query = jobs_query.filter(
+            (model.company_name.ilike(f'%{search_query}%')) |
+            (model.job_title.ilike(f'%{search_query}%')) |
+            (model.job_type.ilike(f'%{search_query}%'))
+        )
+    
+    # Apply status filter
+    if status_filter != 'all':
+        jobs_query = jobs_query.filter(model.response_status == status_filter)
+    
+    # Apply score filter
+    if score_filter != 'all':
+        if score_filter == 'high':
+            jobs_query = jobs_query.filter(model.total_score >= 4.0)
+        elif score_filter == 'medium':
+            jobs_query = jobs_query.filter(model.total_score.between(2.5, 3.9))
+        elif score_filter == 'low':
+            jobs_query = jobs_query.filter(model.total_score <= 2.4)
+    
+    # Apply sorting
+    column, descending, _ = JOB_SORTS.get(sort_by, JOB_SORTS['newest'])
+    order = getattr(model, column).desc() if descending else getattr(model, column).asc()
+    return jobs_query.order_by(order)
+
 @app.route("/")
 def home():
     try:
@@ -52,50 +178,22 @@ def home():
         status_filter = request.args.get('status', 'all')
         score_filter = request.args.get('score', 'all')
         sort_by = request.args.get('sort', 'newest')
+        include_archived = request.args.get('archived') == '1'
         
-        # Start with all jobs
-        jobs_query = Job.query
-        
-        # Apply search filter
-        if search_query:
-            jobs_query = jobs_query.filter(
-                (Job.company_name.ilike(f'%{search_query}%')) |
-                (Job.job_title.ilike(f'%{search_query}%')) |
-                (Job.job_type.ilike(f'%{search_query}%'))
-            )
-        
-        # Apply status filter
-        if status_filter != 'all':
-            jobs_query = jobs_query.filter(Job.response_status == status_filter)
-        
-        # Apply score filter
-        if score_filter != 'all':
-            if score_filter == 'high':
-                jobs_query = jobs_query.filter(Job.total_score >= 4.0)
-            elif score_filter == 'medium':
-                jobs_query = jobs_query.filter(Job.total_score.between(2.5, 3.9))
-            elif score_filter == 'low':
-                jobs_query = jobs_query.filter(Job.total_score <= 2.4)
-        
-        # Apply sorting
-        if sort_by == 'newest':
-            jobs_query = jobs_query.order_by(Job.application_date.desc())
-        elif sort_by == 'oldest':
-            jobs_query = jobs_query.order_by(Job.application_date.asc())
-        elif sort_by == 'highest_score':
-            jobs_query = jobs_query.order_by(Job.total_score.desc())
-        elif sort_by == 'lowest_score':
-            jobs_query = jobs_query.order_by(Job.total_score.asc())
-        elif sort_by == 'company':
-            jobs_query = jobs_query.order_by(Job.company_name.asc())
-        else:
-            jobs_query = jobs_query.order_by(Job.application_date.desc())
+        # Active applications only, unless the archive was asked for
+        jobs = filter_jobs(Job, search_query, status_filter, score_filter, sort_by).all()
         
-        jobs = jobs_query.all()
+        if include_archived:
+            jobs += filter_jobs(ArchivedJob, search_query, status_filter, score_filter, sort_by).all()
+            column, descending, empty = JOB_SORTS.get(sort_by, JOB_SORTS['newest'])
+            jobs.sort(key=lambda job: getattr(job, column) if getattr(job, column) is not None else empty,
+                      reverse=descending)
         
         # Get unique status values for filter dropdown
         unique_statuses = db.session.query(Job.response_status).distinct().all()
-        status_options = [status[0] for status in unique_statuses if status[0]]
+        if include_archived:
+            unique_statuses += db.session.query(ArchivedJob.response_status).distinct().all()
+        status_options = sorted(set(status[0] for status in unique_statuses if status[0]))
         
         return render_template("index.html", 
                              jobs=jobs, 
@@ -106,6 +204,7 @@ def home():
                              status_filter=status_filter,
                              score_filter=score_filter,
                              sort_by=sort_by,
+                             include_archived=include_archived,
                              status_options=status_options,
                              total_jobs=len(jobs))
         
@@ -163,10 +262,18 @@ def create_db():
 
 
 @app.route("/dashboard-data")
+@admission.limit('dashboard', coalesce=True)
 def dashboard_data_enhanced():  # Changed from dashboard_data
     try:
         days_filter = request.args.get('days', 'all')
+        include_archived = request.args.get('archived') == '1'
         jobs = Job.query.all()
+        if include_archived:
+            jobs += ArchivedJob.query.all()
+            rollups = []
+        else:
+            # Archived rows only come back as rollups, so aggregates keep their history
+            rollups = get_archive_rollups(days_filter)
         
         # Filter by date if needed
         if days_filter != 'all':
@@ -187,25 +294,30 @@ def dashboard_data_enhanced():  # Changed from dashboard_data
         
         # Modular data preparation
                 # Modular data preparation
+        archived_count = sum(rollup.count for rollup in rollups_for(rollups, 'all'))
         chart_data = {
             'filters': {
-                'total_applications': len(jobs),
+                'total_applications': len(jobs) + archived_count,
+                'archived_applications': archived_count,
                 'days_filter': days_filter,
+                'include_archived': include_archived,
                 'date_range': f"Last {days_filter} days" if days_filter != 'all' else "All time"
             },
             'charts': {
-                'score_distribution': get_score_distribution(jobs),
+                'score_distribution': get_score_distribution(jobs, rollups),
                 'scatter_analysis': get_scatter_analysis(jobs),
-                'industry_analysis': get_industry_analysis(jobs),
-                'application_trends': get_application_trends(jobs),
-                'success_patterns': get_success_patterns(jobs),
-                'salary_analysis': get_salary_analysis(jobs),
-                'location_analysis': get_location_analysis(jobs),
+                'industry_analysis': get_industry_analysis(jobs, rollups),
+                'application_trends': get_application_trends(jobs, rollups),
+                'success_patterns': get_success_patterns(jobs, rollups),
+                'salary_analysis': get_salary_analysis(jobs, rollups),
+                'location_analysis': get_location_analysis(jobs, rollups),
                 'growth_vs_interest': get_growth_vs_interest(jobs),
-                'industry_averages': get_industry_averages(jobs),
-                'status_analysis': get_status_analysis(jobs),
-                'interest_distribution': get_interest_distribution(jobs)
-            }
+                'industry_averages': get_industry_averages(jobs, rollups),
+                'status_analysis': get_status_analysis(jobs, rollups),
+                'interest_distribution': get_interest_distribution(jobs, rollups)
+            },
+            # All-time percentiles from the stored sketches (not affected by days filter)
+            'score_percentiles': get_score_percentiles()
         }
         
         return chart_data
@@ -217,7 +329,7 @@ def dashboard_data_enhanced():  # Changed from dashboard_data
 def dashboard():
     return render_template("dashboard.html")
 
-def get_location_analysis(jobs):
+def get_location_analysis(jobs, rollups=()):
     location_counts = {}
     for job in jobs:
         if job.location:
@@ -225,15 +337,19 @@ def get_location_analysis(jobs):
             location = job.location.strip()
             if location:
                 location_counts[location] = location_counts.get(location, 0) + 1
+    for rollup in rollups_for(rollups, 'location'):
+        location_counts[rollup.group_key] = location_counts.get(rollup.group_key, 0) + rollup.count
     return dict(sorted(location_counts.items(), key=lambda x: x[1], reverse=True)[:8])
 
-def get_salary_analysis(jobs):
+def get_salary_analysis(jobs, rollups=()):
     salary_data = {'1': 0, '2': 0, '3': 0, '4': 0, '5': 0}
     for job in jobs:
         if job.salary_fit:
             score = int(job.salary_fit)
             if 1 <= score <= 5:
                 salary_data[str(score)] += 1
+    for rollup in rollups_for(rollups, 'salary_fit'):
+        salary_data[rollup.group_key] += rollup.count
     return salary_data
 
 def get_growth_vs_interest(jobs):
@@ -249,7 +365,7 @@ def get_growth_vs_interest(jobs):
         })
     return scatter_data
 
-def get_industry_averages(jobs):
+def get_industry_averages(jobs, rollups=()):
     """Calculate average scores per industry"""
     industry_data = {}
     
@@ -275,6 +391,8 @@ def get_industry_averages(jobs):
                     industry_data[industry]['total_salary'] += job.salary_fit
                     industry_data[industry]['total_overall'] += job.total_score
     
+    add_rollup_totals(industry_data, rollups_for(rollups, 'industry'))
+    
     # Convert to averages
     result = {}
     for industry, data in industry_data.items():
@@ -291,17 +409,21 @@ def get_industry_averages(jobs):
     return result
 
 # Modular chart data functions - easy to add new ones!
-def get_score_distribution(jobs):
+def get_score_bucket(total_score):
+    if total_score <= 2:
+        return '1-2'
+    elif total_score <= 3:
+        return '2-3'
+    elif total_score <= 4:
+        return '3-4'
+    return '4-5'
+
+def get_score_distribution(jobs, rollups=()):
     distribution = {'1-2': 0, '2-3': 0, '3-4': 0, '4-5': 0}
     for job in jobs:
-        if job.total_score <= 2:
-            distribution['1-2'] += 1
-        elif job.total_score <= 3:
-            distribution['2-3'] += 1
-        elif job.total_score <= 4:
-            distribution['3-4'] += 1
-        else:
-            distribution['4-5'] += 1
+        distribution[get_score_bucket(job.total_score)] += 1
+    for rollup in rollups_for(rollups, 'score_bucket'):
+        distribution[rollup.group_key] += rollup.count
     return distribution
 
 def get_scatter_analysis(jobs):
@@ -317,7 +439,7 @@ def get_scatter_analysis(jobs):
         })
     return scatter_data
 
-def get_status_analysis(jobs):
+def get_status_analysis(jobs, rollups=()):
     """Calculate average scores for each application status"""
     status_data = {}
     
@@ -341,6 +463,8 @@ def get_status_analysis(jobs):
         status_data[status]['total_salary'] += job.salary_fit
         status_data[status]['total_overall'] += job.total_score
     
+    add_rollup_totals(status_data, rollups_for(rollups, 'status'))
+    
     # Convert to averages
     result = {}
     for status, data in status_data.items():
@@ -356,7 +480,7 @@ def get_status_analysis(jobs):
     
     return result
 
-def get_interest_distribution(jobs):
+def get_interest_distribution(jobs, rollups=()):
     """Count applications by interest level"""
     interest_counts = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
     
@@ -365,9 +489,12 @@ def get_interest_distribution(jobs):
         if 1 <= interest_level <= 5:
             interest_counts[interest_level] += 1
     
+    for rollup in rollups_for(rollups, 'interest_level'):
+        interest_counts[int(rollup.group_key)] += rollup.count
+    
     return interest_counts
 
-def get_industry_analysis(jobs):
+def get_industry_analysis(jobs, rollups=()):
     industry_counts = {}
     for job in jobs:
         if job.job_type:
@@ -375,20 +502,26 @@ def get_industry_analysis(jobs):
             for industry in industries:
                 if industry:
                     industry_counts[industry] = industry_counts.get(industry, 0) + 1
+    for rollup in rollups_for(rollups, 'industry'):
+        industry_counts[rollup.group_key] = industry_counts.get(rollup.group_key, 0) + rollup.count
     return dict(sorted(industry_counts.items(), key=lambda x: x[1], reverse=True)[:10])
 
-def get_application_trends(jobs):
+def get_application_trends(jobs, rollups=()):
     # Group applications by week
     from collections import defaultdict
     from datetime import datetime
     weekly_trends = defaultdict(int)
     
-    for job in jobs:
-        if job.application_date:
+    # Archived applications are rolled up per date, so they carry a count instead of 1
+    dated = [(job.application_date, 1) for job in jobs]
+    dated += [(rollup.application_date, rollup.count) for rollup in rollups_for(rollups, 'all')]
+    
+    for application_date, count in dated:
+        if application_date:
             try:
-                app_date = datetime.strptime(job.application_date, '%Y-%m-%d')
+                app_date = datetime.strptime(application_date, '%Y-%m-%d')
                 week_key = app_date.strftime('%Y-%U')  # Year-Week number
-                weekly_trends[week_key] += 1
+                weekly_trends[week_key] += count
             except ValueError:
                 continue
     
@@ -397,20 +530,217 @@ def get_application_trends(jobs):
                   for week, count in sorted(weekly_trends.items())]
     return trends_data
 
-def get_success_patterns(jobs):
+def get_success_patterns(jobs, rollups=()):
     # Analyze what makes high-scoring jobs different
-    high_score_jobs = [j for j in jobs if j.total_score >= 4]
-    low_score_jobs = [j for j in jobs if j.total_score <= 2]
+    bands = {band: dict.fromkeys(['count', 'total_interest', 'total_growth'], 0) for band in ('high', 'low')}
+    for job in jobs:
+        band = get_score_band(job.total_score)
+        if band:
+            bands[band]['count'] += 1
+            bands[band]['total_interest'] += job.interest_level
+            bands[band]['total_growth'] += job.growth_potential
+    for rollup in rollups_for(rollups, 'score_band'):
+        bands[rollup.group_key]['count'] += rollup.count
+        bands[rollup.group_key]['total_interest'] += rollup.total_interest
+        bands[rollup.group_key]['total_growth'] += rollup.total_growth
     
+    high, low = bands['high'], bands['low']
     return {
-        'high_score_avg_interest': sum(j.interest_level for j in high_score_jobs) / len(high_score_jobs) if high_score_jobs else 0,
-        'high_score_avg_growth': sum(j.growth_potential for j in high_score_jobs) / len(high_score_jobs) if high_score_jobs else 0,
-        'low_score_avg_interest': sum(j.interest_level for j in low_score_jobs) / len(low_score_jobs) if low_score_jobs else 0,
-        'low_score_avg_growth': sum(j.growth_potential for j in low_score_jobs) / len(low_score_jobs) if low_score_jobs else 0,
-        'high_score_count': len(high_score_jobs),
-        'low_score_count': len(low_score_jobs)
+        'high_score_avg_interest': high['total_interest'] / high['count'] if high['count'] else 0,
+        'high_score_avg_growth': high['total_growth'] / high['count'] if high['count'] else 0,
+        'low_score_avg_interest': low['total_interest'] / low['count'] if low['count'] else 0,
+        'low_score_avg_growth': low['total_growth'] / low['count'] if low['count'] else 0,
+        'high_score_count': high['count'],
+        'low_score_count': low['count']
     }
 
+def get_score_band(total_score):
+    """'high' (4+), 'low' (2 or under) or None - the groups success patterns compare"""
+    if total_score >= 4:
+        return 'high'
+    if total_score <= 2:
+        return 'low'
+    return None
+
+def rollups_for(rollups, dimension):
+    return [rollup for rollup in rollups if rollup.dimension == dimension]
+
+def add_rollup_totals(group_data, rollups):
+    """Add archived counts and score sums into a per-group accumulator"""
+    for rollup in rollups:
+        data = group_data.setdefault(rollup.group_key, dict.fromkeys(['count', *ROLLUP_SCORE_COLUMNS], 0))
+        data['count'] += rollup.count
+        for field in ROLLUP_SCORE_COLUMNS:
+            data[field] += getattr(rollup, field) or 0
+
+def get_sketch_groups(job):
+    """Groups a job contributes to: everyone, its status and each industry tag"""
+    groups = [('all', 'All'), ('status', job.response_status or 'Applied')]
+    if job.job_type:
+        for industry in [tag.strip() for tag in job.job_type.split(',')]:
+            if industry:
+                groups.append(('industry', industry))
+    return groups
+
+def record_score_sketches(jobs):
+    """Fold jobs into the persisted percentile sketches (caller commits)"""
+    rows = {(row.dimension, row.group_key, row.metric): row for row in ScoreSketch.query.all()}
+    sketches = {}
+    
+    for job in jobs:
+        for dimension, group_key in get_sketch_groups(job):
+            for metric in SKETCH_METRICS:
+                value = getattr(job, metric)
+                if value is None:
+                    continue
+                key = (dimension, group_key, metric)
+                if key not in sketches:
+                    row = rows.get(key)
+                    if row is None:
+                        row = ScoreSketch(dimension=dimension, group_key=group_key, metric=metric)
+                        db.session.add(row)
+                    sketches[key] = (row, KLLSketch.from_json(row.sketch) if row.sketch else KLLSketch())
+                sketches[key][1].update(value)
+    
+    for row, sketch in sketches.values():
+        row.sketch = sketch.to_json()
+        row.count = sketch.n
+
+def get_score_percentiles():
+    """Median and p90 of each score per status and industry, read from the sketches"""
+    result = {}
+    try:
+        rows = ScoreSketch.query.all()
+    except Exception:
+        # Percentiles are an extra - never let them take the rest of the dashboard down
+        db.session.rollback()
+        return result
+    
+    for row in rows:
+        if not row.sketch:
+            continue
+        sketch = KLLSketch.from_json(row.sketch)
+        group = result.setdefault(row.dimension, {}).setdefault(row.group_key, {'count': 0})
+        group[row.metric] = {
+            'median': round(sketch.quantile(0.5), 1),
+            'p90': round(sketch.quantile(0.9), 1)
+        }
+        group['count'] = max(group['count'], row.count or 0)
+    return result
+
+@app.route("/rebuild-score-sketches")
+@admission.limit('import')  # batch write - never overlaps an import or archive run
+def rebuild_score_sketches():
+    try:
+        # Archived rows count too, so the all-time percentiles survive archiving
+        ScoreSketch.query.delete()
+        record_score_sketches(Job.query.all() + ArchivedJob.query.all())
+        db.session.commit()
+        return "✅ Score percentiles rebuilt! <a href='/dashboard'>View dashboard</a>"
+    except Exception as e:
+        db.session.rollback()
+        return f"Error rebuilding score percentiles: {str(e)}"
+
+def get_rollup_groups(job):
+    """Every chart group an archived job still has to count towards"""
+    groups = [
+        ('all', 'All'),
+        ('status', job.response_status or 'Applied'),
+        ('score_bucket', get_score_bucket(job.total_score))
+    ]
+    if get_score_band(job.total_score):
+        groups.append(('score_band', get_score_band(job.total_score)))
+    if job.job_type:
+        for industry in [tag.strip() for tag in job.job_type.split(',')]:
+            if industry:
+                groups.append(('industry', industry))
+    if job.location and job.location.strip():
+        groups.append(('location', job.location.strip()))
+    if job.salary_fit and 1 <= int(job.salary_fit) <= 5:
+        groups.append(('salary_fit', str(int(job.salary_fit))))
+    if job.interest_level and 1 <= int(job.interest_level) <= 5:
+        groups.append(('interest_level', str(int(job.interest_level))))
+    return groups
+
+def record_archive_rollups(jobs):
+    """Add jobs that are about to be archived to the dashboard rollups (caller commits)"""
+    dates = set(job.application_date for job in jobs)
+    rows = {(row.dimension, row.group_key, row.application_date): row
+            for row in JobRollup.query.filter(JobRollup.application_date.in_(dates)).all()}
+    
+    for job in jobs:
+        for dimension, group_key in get_rollup_groups(job):
+            key = (dimension, group_key, job.application_date)
+            if key not in rows:
+                rows[key] = JobRollup(dimension=dimension, group_key=group_key, application_date=job.application_date,
+                                      count=0, **dict.fromkeys(ROLLUP_SCORE_COLUMNS, 0))
+                db.session.add(rows[key])
+            row = rows[key]
+            row.count += 1
+            for field, column in ROLLUP_SCORE_COLUMNS.items():
+                setattr(row, field, getattr(row, field) + (getattr(job, column) or 0))
+
+def get_archive_rollups(days_filter):
+    """Rollup rows for the dashboard, limited to the same date window as the active jobs"""
+    rollups_query = JobRollup.query
+    if days_filter != 'all':
+        try:
+            from datetime import datetime, timedelta
+            # Matches the active-job filter: a date counts only if it falls after the cutoff moment
+            cutoff = (datetime.now() - timedelta(days=int(days_filter))).strftime('%Y-%m-%d')
+            rollups_query = rollups_query.filter(JobRollup.application_date > cutoff)
+        except ValueError:
+            pass  # Same as the active jobs: a bad filter means all time
+    return rollups_query.all()
+
+def clear_job_data():
+    """Empty active and archived applications plus everything derived from them (caller commits)"""
+    Job.query.delete()
+    ArchivedJob.query.delete()
+    ScoreSketch.query.delete()
+    JobRollup.query.delete()
+
+def archive_old_jobs():
+    """Move finished or stale applications into the archive table (caller commits).
+    
+    Their counts and score sums go into archive_rollups first, so dashboard aggregates
+    keep them. Score sketches are left alone, so the all-time percentiles still cover
+    archived rows too.
+    """
+    from datetime import datetime, timedelta
+    finished_cutoff = (datetime.now() - timedelta(days=app.config["ARCHIVE_AFTER_DAYS"])).strftime('%Y-%m-%d')
+    stale_cutoff = (datetime.now() - timedelta(days=app.config["ARCHIVE_STALE_AFTER_DAYS"])).strftime('%Y-%m-%d')
+    archived_at = datetime.now().strftime('%Y-%m-%d')
+    
+    # Dates are stored as YYYY-MM-DD strings, so string comparison orders them correctly
+    old_jobs = Job.query.filter(
+        Job.application_date != '',
+        ((Job.response_status.in_(app.config["ARCHIVE_STAGES"])) & (Job.application_date < finished_cutoff)) |
+        (Job.application_date < stale_cutoff)
+    ).all()
+    
+    record_archive_rollups(old_jobs)
+    
+    columns = [c.name for c in Job.__table__.columns if c.name != 'id']
+    for job in old_jobs:
+        archived = ArchivedJob(original_id=job.id, archived_at=archived_at,
+                               **{column: getattr(job, column) for column in columns})
+        db.session.add(archived)
+        db.session.delete(job)
+    
+    return len(old_jobs)
+
+@app.route("/archive-jobs")
+@admission.limit('import')  # shares the batch-write slot so it never overlaps an import
+def archive_jobs():
+    try:
+        archived_count = archive_old_jobs()
+        db.session.commit()
+        return f"✅ Archived {archived_count} old applications! <a href='/'>View active jobs</a>"
+    except Exception as e:
+        db.session.rollback()
+        return f"Error archiving jobs: {str(e)}"
+
 @app.route("/edit/<int:job_id>", methods=["GET", "POST"])
 def edit_job(job_id):
     job = Job.query.get(job_id)
@@ -459,6 +789,7 @@ def edit_job(job_id):
                          score_options=SCORE_OPTIONS)
 
 @app.route("/import-csv-correct")
+@admission.limit('import')
 def import_csv_correct():
     try:
         csv_file = "jobs.csv"
@@ -466,7 +797,8 @@ def import_csv_correct():
         if not os.path.exists(csv_file):
             return f"❌ CSV file '{csv_file}' not found"
         
-        Job.query.delete()
+        # The CSV replaces everything, including previously archived rows
+        clear_job_data()
         
         imported_count = 0
         with open(csv_file, 'r') as file:
@@ -547,10 +879,13 @@ def debug_dashboard():
         return {'error': str(e)}
 
 @app.route("/export-jobs")
+@admission.limit('export')
 def export_jobs():
     try:
-        # Get all jobs (you can add filters later if needed)
+        # Get all active jobs, plus the archive when asked for
         jobs = Job.query.all()
+        if request.args.get('archived') == '1':
+            jobs += ArchivedJob.query.all()
         
         # Create CSV content
         output = []
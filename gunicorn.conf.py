@@ -0,0 +1,14 @@
+# gunicorn.conf.py - picked up automatically by `gunicorn app:app`
+import os
+
+# Threaded workers, so one slow import/export/dashboard request doesn't tie up a
+# whole process and the admission limits in app.py can actually kick in
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+
+# Import app.py once in the master so its startup create_all() doesn't run in every worker
+preload_app = True
+
+# Heavy routes can hold at most concurrency + queue (+ coalesced followers) threads each
+# (import 1+0, export 2+2, dashboard 2+4+6 = 17), leaving the rest for home() and forms
+threads = int(os.environ.get('GUNICORN_THREADS', 24))
@@ -1,5 +1,5 @@
 import os
-from app import app, db, Job, STAGE_OPTIONS
+from app import app, db, Job, STAGE_OPTIONS, clear_job_data
 from datetime import datetime, timedelta
 import random
 
@@ -7,8 +7,9 @@ def seed_demo_data():
     """Seed the database with fake job applications for demo purposes"""
     
     # Check if table exists and clear existing data if it does
+    # (archive, rollups and score sketches too - new jobs are added to the sketches on commit)
     try:
-        db.session.query(Job).delete()
+        clear_job_data()
     except:
         # Table doesn't exist yet, that's fine
         pass
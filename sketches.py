@@ -0,0 +1,111 @@
+import json
+import math
+import random
+
+
+class KLLSketch:
+    """Mergeable streaming quantile sketch (KLL).
+
+    Keeps a stack of compactors; level h holds items that each stand for
+    2**h original values. Memory stays around 3*k items no matter how many
+    values are added, and two sketches can be merged without the raw data.
+    """
+
+    def __init__(self, k=200):
+        self.k = k
+        self.n = 0
+        self.compactors = [[]]
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _size(self):
+        return sum(len(items) for items in self.compactors)
+
+    def _max_size(self):
+        return sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def update(self, value):
+        self.compactors[0].append(float(value))
+        self.n += 1
+        if self._size() >= self._max_size():
+            self._compress()
+
+    def merge(self, other):
+        """Fold another sketch into this one."""
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.n += other.n
+        while self._size() >= self._max_size():
+            self._compress()
+        return self
+
+    def _compress(self):
+        for level in range(len(self.compactors)):
+            items = self.compactors[level]
+            if len(items) < self._capacity(level):
+                continue
+            if level + 1 == len(self.compactors):
+                self.compactors.append([])
+            items.sort()
+            # Keep one item back when the count is odd so weights stay exact
+            leftover = [items.pop()] if len(items) % 2 else []
+            offset = random.randint(0, 1)
+            self.compactors[level + 1].extend(items[offset::2])
+            self.compactors[level] = leftover
+            if self._size() < self._max_size():
+                break
+
+    def quantile(self, q):
+        """Approximate value at rank q (0.0 - 1.0), or None if empty."""
+        if self.n == 0:
+            return None
+        weighted = sorted(
+            (value, 2 ** level)
+            for level, items in enumerate(self.compactors)
+            for value in items
+        )
+        total_weight = sum(weight for _, weight in weighted)
+        target = q * total_weight
+        running = 0
+        for value, weight in weighted:
+            running += weight
+            if running >= target:
+                return value
+        return weighted[-1][0]
+
+    def to_json(self):
+        return json.dumps({'k': self.k, 'n': self.n, 'compactors': self.compactors})
+
+    @classmethod
+    def from_json(cls, data):
+        state = json.loads(data)
+        sketch = cls(k=state['k'])
+        sketch.n = state['n']
+        sketch.compactors = state['compactors'] or [[]]
+        return sketch
+
+
+if __name__ == "__main__":
+    # Quick accuracy check: python sketches.py
+    import bisect
+
+    values = [random.random() for _ in range(200000)]
+    left, right = KLLSketch(), KLLSketch()
+    for value in values[:100000]:
+        left.update(value)
+    for value in values[100000:]:
+        right.update(value)
+    merged = KLLSketch.from_json(left.merge(right).to_json())
+
+    values.sort()
+    weight = sum(len(items) * 2 ** level for level, items in enumerate(merged.compactors))
+    assert merged.n == len(values) == weight, "merge lost weight"
+    for q in (0.5, 0.9, 0.99):
+        rank = bisect.bisect_right(values, merged.quantile(q)) / len(values)
+        assert abs(rank - q) < 0.01, f"p{int(q * 100)} rank error {abs(rank - q):.4f}"
+        print(f"p{int(q * 100)}: rank error {abs(rank - q):.4%}")
+    print(f"✅ {merged.n} values kept in {sum(len(items) for items in merged.compactors)} items")